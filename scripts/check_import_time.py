@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Import-time budget check for the CLI scripts.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for each
+script module and fails if its cumulative import time exceeds the budget. Heavy
+dependencies (numpy, nltk, transformers, ...) must be imported inside the
+functions that use them, not at module level.
+
+Usage:
+  python scripts/check_import_time.py
+  python scripts/check_import_time.py --budget-ms 75 --modules utils compute_aggregates
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_MODULES = [
+    "utils",
+    "compute_aggregates",
+    "enrich_sentiment",
+    "generate_suggestions",
+    "tag_categories_zeroshot",
+    "llm_suggestions",
+]
+
+# Never acceptable at import time of a lightweight script.
+HEAVY_MODULES = {"numpy", "nltk", "transformers", "torch", "sentence_transformers", "pandas"}
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Map imported module name -> cumulative microseconds from -X importtime output."""
+    out = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative = int(parts[1].strip())
+        except ValueError:  # header row
+            continue
+        out[parts[2].strip()] = cumulative
+    return out
+
+
+def measure(module: str) -> Dict[str, int]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Fail if script modules exceed an import-time budget")
+    ap.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    ap.add_argument("--budget-ms", type=float, default=75.0)
+    args = ap.parse_args()
+
+    failures: List[str] = []
+    for mod in args.modules:
+        times = measure(mod)
+        ms = times.get(mod, 0) / 1000.0
+        heavy = sorted(HEAVY_MODULES.intersection(times))
+        status = "ok"
+        if ms > args.budget_ms:
+            status = "OVER BUDGET"
+            failures.append(f"{mod}: {ms:.1f} ms > {args.budget_ms:.1f} ms")
+        if heavy:
+            status = "HEAVY IMPORT"
+            failures.append(f"{mod}: imports {', '.join(heavy)} at module level")
+        print(f"{mod:<28} {ms:8.1f} ms  {status}")
+
+    if failures:
+        print("\n".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
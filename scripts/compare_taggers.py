@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Accuracy-vs-speed report: NLI zero-shot tagger vs embedding tagger.
+
+Runs both taggers on a labeled sample (JSONL rows with `text` and gold
+`categories`) and reports micro precision/recall/F1 against gold, agreement
+between the two taggers, and throughput.
+
+The gold labels must be independent of both taggers: do not point --gold at a
+file either tagger produced (e.g. sentiment_reviews_tagged.jsonl), or that
+tagger is scored against itself. The default is a small hand-labeled sample.
+
+Usage:
+  python scripts/compare_taggers.py --gold data/processed/samples/category_gold_sample.jsonl --out data/processed/aggregates/tagger_report.json
+"""
+import argparse
+import json
+import os
+import time
+from typing import Dict, List, Set
+
+from tag_categories_zeroshot import LABELS
+from utils import read_jsonl
+
+
+def micro_prf(pred: List[Set[str]], gold: List[Set[str]]) -> Dict[str, float]:
+    tp = sum(len(p & g) for p, g in zip(pred, gold))
+    fp = sum(len(p - g) for p, g in zip(pred, gold))
+    fn = sum(len(g - p) for p, g in zip(pred, gold))
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": round(precision, 4), "recall": round(recall, 4), "f1": round(f1, 4)}
+
+
+def exact_agreement(a: List[Set[str]], b: List[Set[str]]) -> float:
+    return round(sum(x == y for x, y in zip(a, b)) / max(1, len(a)), 4)
+
+
+def timed(fn, texts: List[str], batch_size: int):
+    start = time.perf_counter()
+    out = []
+    for i in range(0, len(texts), batch_size):
+        out.extend(set(t) for t in fn(texts[i:i + batch_size]))
+    elapsed = time.perf_counter() - start
+    return out, elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare NLI and embedding category taggers")
+    ap.add_argument("--gold", default="data/processed/samples/category_gold_sample.jsonl",
+                    help="Hand-labeled JSONL (text + categories), not produced by either tagger")
+    ap.add_argument("--limit", type=int, default=200)
+    ap.add_argument("--nli-model", default="facebook/bart-large-mnli")
+    ap.add_argument("--nli-threshold", type=float, default=0.4)
+    ap.add_argument("--emb-model", default=None)
+    ap.add_argument("--emb-threshold", type=float, default=0.45)
+    ap.add_argument("--batch-size", type=int, default=16)
+    ap.add_argument("--out", default=None, help="Optional JSON report path")
+    args = ap.parse_args()
+
+    from embedding_tagger import DEFAULT_MODEL, EmbeddingTagger
+    from tag_categories_zeroshot import load_zeroshot, zeroshot_labels
+
+    rows = read_jsonl(args.gold)[: args.limit]
+    texts = [r.get("text", "") for r in rows]
+    gold = [set(c for c in r.get("categories", []) if c in LABELS) for r in rows]
+
+    t0 = time.perf_counter()
+    nlp = load_zeroshot(args.nli_model)
+    nli_load = time.perf_counter() - t0
+    nli_pred, nli_time = timed(lambda b: zeroshot_labels(nlp, b, args.nli_threshold, args.batch_size), texts, args.batch_size)
+
+    t0 = time.perf_counter()
+    tagger = EmbeddingTagger(args.emb_model or DEFAULT_MODEL)
+    emb_load = time.perf_counter() - t0
+    emb_pred, emb_time = timed(lambda b: tagger.tag(b, args.emb_threshold), texts, args.batch_size)
+
+    n = max(1, len(texts))
+    report = {
+        "n_reviews": len(texts),
+        "nli": {
+            "model": args.nli_model, **micro_prf(nli_pred, gold),
+            "load_s": round(nli_load, 3), "ms_per_review": round(nli_time * 1000 / n, 2),
+        },
+        "embedding": {
+            "model": tagger.model_name, **micro_prf(emb_pred, gold),
+            "load_s": round(emb_load, 3), "ms_per_review": round(emb_time * 1000 / n, 2),
+        },
+        "embedding_vs_nli": {
+            **micro_prf(emb_pred, nli_pred),
+            "exact_agreement": exact_agreement(emb_pred, nli_pred),
+            "speedup": round(nli_time / emb_time, 1) if emb_time else None,
+        },
+    }
+    print(json.dumps(report, indent=2))
+    if args.out:
+        os.makedirs(os.path.dirname(args.out), exist_ok=True)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Wrote report -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
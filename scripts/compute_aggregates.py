@@ -12,9 +12,16 @@ def main():
     ap = argparse.ArgumentParser(description="Compute aggregates for sentiment and benchmarks")
     ap.add_argument("--reviews", default="data/processed/sentiment_reviews.jsonl")
     ap.add_argument("--out", default="data/processed/aggregates/aggregates.json")
+    ap.add_argument("--dedupe", action="store_true", help="Count one review per near-duplicate cluster")
     args = ap.parse_args()
 
     rows = read_jsonl(args.reviews)
+    if args.dedupe:
+        from dedupe_reviews import assign_clusters, representatives
+
+        if not all("cluster_id" in r for r in rows):
+            assign_clusters(rows)
+        rows = representatives(rows)
     labels = Counter(r.get("label", "unknown") for r in rows)
     scores = [float(r.get("score", 0)) for r in rows if "score" in r]
     cats = Counter(c for r in rows for c in r.get("categories", []))
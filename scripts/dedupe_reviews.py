@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Near-duplicate review detection with shingling + MinHash + LSH banding.
+
+Each review is reduced to a set of character shingles, summarized by a MinHash
+signature, and bucketed per LSH band; only reviews sharing a bucket are compared,
+so clustering is sub-quadratic. Bucket-mates whose estimated Jaccard similarity
+reaches --threshold are merged with union-find.
+
+Adds to each row:
+  cluster_id          int, shared by near-duplicates (0..n_clusters-1)
+  cluster_rep         true for exactly one row per cluster (the first seen)
+
+Usage:
+  python scripts/dedupe_reviews.py --in data/processed/sentiment_reviews.jsonl --out data/processed/sentiment_reviews_dedup.jsonl
+"""
+import argparse
+import os
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterator, List, Set
+
+from utils import read_jsonl, write_jsonl
+
+MERSENNE_PRIME = (1 << 31) - 1
+_WS = re.compile(r"\s+")
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def shingles(text: str, k: int = 5) -> Set[int]:
+    """32-bit hashes of character k-grams of the normalized text."""
+    norm = _WS.sub(" ", _NON_WORD.sub("", text.lower())).strip()
+    if len(norm) <= k:
+        return {zlib.crc32(norm.encode("utf-8")) & MERSENNE_PRIME}
+    return {zlib.crc32(norm[i:i + k].encode("utf-8")) & MERSENNE_PRIME for i in range(len(norm) - k + 1)}
+
+
+class MinHashLSH:
+    """MinHash signatures + LSH banding over a fixed set of hash permutations."""
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, seed: int = 42):
+        import numpy as np
+
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set: Set[int]):
+        import numpy as np
+
+        x = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+        # (num_perm, n_shingles); a, x < 2^31 so a*x + b fits in uint64
+        h = (np.outer(self.a, x) + self.b[:, None]) % MERSENNE_PRIME
+        return h.min(axis=1).astype(np.uint32)
+
+    def signatures(self, texts: List[str], k: int = 5):
+        import numpy as np
+
+        sigs = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        for i, t in enumerate(texts):
+            sigs[i] = self.signature(shingles(t, k))
+        return sigs
+
+    def candidate_buckets(self, sigs) -> Iterator[List[int]]:
+        """Yield each LSH bucket (per band) holding two or more texts."""
+        for band in range(self.bands):
+            buckets: Dict[bytes, List[int]] = defaultdict(list)
+            chunk = sigs[:, band * self.rows:(band + 1) * self.rows]
+            for i in range(chunk.shape[0]):
+                buckets[chunk[i].tobytes()].append(i)
+            for members in buckets.values():
+                if len(members) > 1:
+                    yield members
+
+
+def cluster_texts(texts: List[str], threshold: float = 0.5, num_perm: int = 128,
+                  bands: int = 32, k: int = 5, seed: int = 42) -> List[int]:
+    """Return a cluster id per text; near-duplicates share an id."""
+    if not texts:
+        return []
+    lsh = MinHashLSH(num_perm=num_perm, bands=bands, seed=seed)
+    sigs = lsh.signatures(texts, k=k)
+
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for members in lsh.candidate_buckets(sigs):
+        # Check each member against one representative per group already formed in
+        # this bucket, so a pair that shares a band but misses the threshold doesn't
+        # stop either side from joining the texts it does match.
+        reps: List[int] = []
+        for j in members:
+            for i in reps:
+                ri, rj = find(i), find(j)
+                if ri == rj:
+                    break
+                if float((sigs[i] == sigs[j]).mean()) >= threshold:
+                    parent[max(ri, rj)] = min(ri, rj)
+                    break
+            else:
+                reps.append(j)
+
+    ids: Dict[int, int] = {}
+    return [ids.setdefault(find(i), len(ids)) for i in range(len(texts))]
+
+
+def assign_clusters(rows: List[Dict], **kwargs) -> List[Dict]:
+    """Set cluster_id / cluster_rep on each row in place and return rows."""
+    seen = set()
+    for r, cid in zip(rows, cluster_texts([r.get("text", "") for r in rows], **kwargs)):
+        r["cluster_id"] = cid
+        r["cluster_rep"] = cid not in seen
+        seen.add(cid)
+    return rows
+
+
+def representatives(rows: List[Dict]) -> List[Dict]:
+    """One row per cluster; rows without cluster ids are treated as singletons."""
+    return [r for r in rows if r.get("cluster_rep", True)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cluster near-duplicate reviews with MinHash LSH")
+    ap.add_argument("--in", dest="in_path", default="data/processed/sentiment_reviews.jsonl")
+    ap.add_argument("--out", dest="out_path", default="data/processed/sentiment_reviews_dedup.jsonl")
+    ap.add_argument("--threshold", type=float, default=0.5, help="Min estimated Jaccard to merge")
+    ap.add_argument("--num-perm", type=int, default=128)
+    ap.add_argument("--bands", type=int, default=32)
+    ap.add_argument("--shingle", type=int, default=5, help="Character shingle length")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rows = read_jsonl(args.in_path)
+    assign_clusters(rows, threshold=args.threshold, num_perm=args.num_perm,
+                    bands=args.bands, k=args.shingle, seed=args.seed)
+    n_clusters = len({r["cluster_id"] for r in rows})
+    os.makedirs(os.path.dirname(args.out_path), exist_ok=True)
+    write_jsonl(args.out_path, rows)
+    print(f"Clustered {len(rows)} reviews into {n_clusters} groups -> {args.out_path}")
+
+
+if __name__ == "__main__":
+    main()
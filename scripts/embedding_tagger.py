@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Embedding-based category tagging: a fast alternative to the NLI zero-shot tagger.
+
+Each review is encoded once with a small sentence-transformers model and scored
+against precomputed label prototype embeddings by cosine similarity, so cost no
+longer grows with len(LABELS) forward passes per review. Label embeddings are
+cached on disk, keyed by model name and prototype text.
+
+Usage:
+  python scripts/embedding_tagger.py --in data/processed/sentiment_reviews.jsonl --out data/processed/sentiment_reviews_tagged.jsonl
+  (or: python scripts/tag_categories_zeroshot.py --mode embedding ...)
+
+Requires: sentence-transformers, numpy
+Model: sentence-transformers/all-MiniLM-L6-v2 (default) – CPU friendly.
+"""
+import argparse
+import hashlib
+import json
+import os
+from typing import Dict, List
+
+from utils import read_jsonl, write_jsonl
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_CACHE_DIR = "data/processed/cache"
+
+# A few short phrasings per label; a review's score for a label is its best prototype match.
+LABEL_PROTOTYPES: Dict[str, List[str]] = {
+    "communication": [
+        "communication with the client", "clear updates and collaboration", "communication gaps",
+    ],
+    "quality": [
+        "quality of the work", "polished, clean deliverables", "output did not meet expectations",
+    ],
+    "responsiveness": [
+        "responded quickly to messages", "slow to reply", "responsive to feedback",
+    ],
+    "deadlines": [
+        "delivered on time", "missed the deadline", "ahead of schedule",
+    ],
+    "scope": [
+        "project scope and requirements", "unclear scope", "suggestions on the brief",
+    ],
+    "documentation": [
+        "documentation of the work", "documentation was lacking", "README and handover notes",
+    ],
+}
+
+
+class EmbeddingTagger:
+    """Multi-label tagger scoring texts against cached label prototype embeddings."""
+
+    def __init__(self, model: str = DEFAULT_MODEL, cache_dir: str = DEFAULT_CACHE_DIR,
+                 prototypes: Dict[str, List[str]] = None, batch_size: int = 64):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model
+        self.model = SentenceTransformer(model, device="cpu")
+        self.prototypes = prototypes or LABEL_PROTOTYPES
+        self.labels = list(self.prototypes)
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir
+        self.proto_emb, self.proto_label = self._label_embeddings()
+
+    def _cache_path(self) -> str:
+        key = json.dumps({"model": self.model_name, "prototypes": self.prototypes}, sort_keys=True)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"label_embeddings_{digest}.npz")
+
+    def _label_embeddings(self):
+        import numpy as np
+
+        path = self._cache_path()
+        if os.path.exists(path):
+            data = np.load(path)
+            # Positions are stored against the label names they were built with, so a
+            # prototype dict with the same content in another order still maps correctly.
+            if "names" in data.files:
+                pos = {str(name): i for i, name in enumerate(self.labels)}
+                remap = np.asarray([pos[str(name)] for name in data["names"]], dtype=np.int16)
+                return data["emb"], remap[data["label"]]
+        texts, owner = [], []
+        for i, lbl in enumerate(self.labels):
+            for p in self.prototypes[lbl]:
+                texts.append(p)
+                owner.append(i)
+        emb = self._encode(texts)
+        label = np.asarray(owner, dtype=np.int16)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        np.savez(path, emb=emb, label=label, names=np.asarray(self.labels, dtype=str))
+        return emb, label
+
+    def _encode(self, texts: List[str]):
+        import numpy as np
+
+        emb = self.model.encode(
+            texts, batch_size=self.batch_size, convert_to_numpy=True,
+            normalize_embeddings=True, show_progress_bar=False,
+        )
+        return emb.astype(np.float32, copy=False)
+
+    def scores(self, texts: List[str]):
+        """(n_texts, n_labels) cosine similarity, max over each label's prototypes."""
+        import numpy as np
+
+        emb = self._encode([t[:1000] for t in texts])
+        sims = emb @ self.proto_emb.T  # normalized -> cosine
+        out = np.full((len(texts), len(self.labels)), -1.0, dtype=np.float32)
+        for i in range(len(self.labels)):
+            cols = self.proto_label == i
+            out[:, i] = sims[:, cols].max(axis=1)
+        return out
+
+    def tag(self, texts: List[str], threshold: float) -> List[List[str]]:
+        if not texts:
+            return []
+        s = self.scores(texts)
+        return [[self.labels[j] for j in range(len(self.labels)) if row[j] >= threshold] for row in s]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Tag review categories with sentence embeddings")
+    ap.add_argument("--in", dest="in_path", default="data/processed/sentiment_reviews.jsonl")
+    ap.add_argument("--out", dest="out_path", default="data/processed/sentiment_reviews.jsonl")
+    ap.add_argument("--model", default=DEFAULT_MODEL)
+    ap.add_argument("--threshold", type=float, default=0.45)
+    ap.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    args = ap.parse_args()
+
+    rows = read_jsonl(args.in_path)
+    tagger = EmbeddingTagger(args.model, cache_dir=args.cache_dir)
+    tags = tagger.tag([r.get("text", "") for r in rows], args.threshold)
+    for r, keep in zip(rows, tags):
+        r["categories"] = sorted(set(r.get("categories", []) + keep))
+
+    os.makedirs(os.path.dirname(args.out_path), exist_ok=True)
+    write_jsonl(args.out_path, rows)
+    print(f"Tagged {len(rows)} reviews -> {args.out_path}")
+
+
+if __name__ == "__main__":
+    main()
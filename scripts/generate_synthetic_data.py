@@ -8,7 +8,7 @@ from typing import List, Dict
 
 import numpy as np
 
-from utils import now_iso, clamp, compute_pseudo_ranking, new_uuid
+from utils import now_iso, clamp, new_uuid
 
 INDUSTRIES = ["Freelancer", "E-commerce", "Developer", "Business"]
 SKILL_VOCAB = [
@@ -136,32 +136,21 @@ def gen_sentiment_reviews(rng: np.random.Generator, users: List[Dict]) -> List[D
 
 
 def gen_comparisons(rng: np.random.Generator, profiles: List[Dict], users: List[Dict]) -> List[Dict]:
-    # Use ranking formula to snapshot pseudo-ranking against a pseudo competitor
-    rows = []
+    # Snapshot pseudo-ranking against the most similar real peer from the skill index
+    from similarity_index import SkillIndex, comparison_row
+
+    index = SkillIndex.from_profiles(profiles)
     prof_by_user = {p["user_id"]: p for p in profiles}
+    rows = []
     for u in users[: min(15, len(users))]:
-        p = prof_by_user[u["id"]]
+        peers = index.top_k(u["id"], k=1)
         # assume 5 milestones total, count completed from generated milestones later (approximate here)
-        score, _ = compute_pseudo_ranking(p, milestone_count=2, total_milestones=5)
-        rows.append({
-            "id": new_uuid(),
-            "user_id": u["id"],
-            "competitor_identifier": f"competitor:{u['id'][:8]}",
-            "competitor_role": "frontend",
-            "pseudo_ranking": score,
-            "snapshot": {
-                "profile_completeness": p["profile_completeness"],
-                "proposal_success_rate": p["proposal_success_rate"],
-                "portfolio_items": p["portfolio_items"],
-                "hourly_rate": p["hourly_rate"],
-                "repeat_clients_rate": p["repeat_clients_rate"],
-            },
-            "created_at": now_iso(),
-        })
+        rows.append(comparison_row(prof_by_user[u["id"]], peers[0][0] if peers else None,
+                                   milestone_count=2, total_milestones=5))
     return rows
 
 
-def gen_mentorship(rng: np.random.Generator, users: List[Dict]):
+def gen_mentorship(rng: np.random.Generator, users: List[Dict], profiles: List[Dict]):
     requests_rows = []
     messages_rows = []
     topics = [
@@ -171,14 +160,12 @@ def gen_mentorship(rng: np.random.Generator, users: List[Dict]):
         "Scaling backend APIs",
     ]
     requesters = users[: min(10, len(users))]
-    mentors = [u for u in users if u["is_mentor"]]
     for i, u in enumerate(requesters):
         req_id = new_uuid()
-        mentor_id = mentors[i % max(1, len(mentors))]["id"] if mentors else None
         requests_rows.append({
             "id": req_id,
             "requester_id": u["id"],
-            "mentor_id": mentor_id,
+            "mentor_id": None,
             "topic": topics[i % len(topics)],
             "context": "Looking for guidance and code review on recent work.",
             "preferred_expertise": ["Senior Frontend", "Performance"],
@@ -192,6 +179,14 @@ def gen_mentorship(rng: np.random.Generator, users: List[Dict]):
             "text": "Hi! Can you review my memo?",
             "created_at": now_iso(),
         })
+
+    # Assign mentors by expertise/skill compatibility within per-mentor capacity
+    from match_mentors import match_requests
+
+    skills = {p["user_id"]: p["skills"] for p in profiles}
+    mentors = [{"id": u["id"], "industry": u["industry"], "skills": skills.get(u["id"], "")} for u in users if u["is_mentor"]]
+    for r, mentor_id in zip(requests_rows, match_requests(requests_rows, mentors)):
+        r["mentor_id"] = mentor_id
     return requests_rows, messages_rows
 
 
@@ -217,7 +212,7 @@ def main():
     milestones = gen_milestones(rng, users)
     reviews = gen_sentiment_reviews(rng, users)
     comparisons = gen_comparisons(rng, profiles, users)
-    m_requests, m_messages = gen_mentorship(rng, users)
+    m_requests, m_messages = gen_mentorship(rng, users, profiles)
 
     # Industries static
     industries = [
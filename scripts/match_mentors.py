@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+"""
+Batch mentor-mentee matching for pending mentorship requests.
+
+Requests are described by terms from `topic` and `preferred_expertise`, mentors
+by their profile skills and industry (expanded through EXPERTISE_TERMS, so
+"Senior Frontend" matches a React/TypeScript mentor). An inverted index
+term -> mentors scores only mentors that share a term, weighted by idf. The
+assignment is greedy over the top-L edges per request sorted by score, honoring
+per-mentor capacity (README_DATA: 0–20 requests per mentor). Requests whose
+top-L mentors fill up then walk the rest of their compatible mentors by score;
+only requests with no compatible mentor left fall back to the mentor with the
+most room left.
+
+Usage:
+  python scripts/match_mentors.py --requests data/processed/mentorship_requests.jsonl --users data/processed/users.csv --profiles data/processed/freelancer_profiles.csv --out data/processed/mentorship_requests.jsonl
+"""
+import argparse
+import csv
+import heapq
+import math
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+from utils import read_jsonl, write_jsonl
+
+DEFAULT_CAPACITY = 20
+# Statuses that already hold a mentor slot.
+ACTIVE_STATUSES = {"accepted", "active", "in_progress"}
+
+EXPERTISE_TERMS: Dict[str, List[str]] = {
+    "frontend": ["react", "vue.js", "angular", "next.js", "typescript", "tailwindcss", "sass", "webpack", "ui/ux design", "figma"],
+    "backend": ["django", "fastapi", "flask", "node.js", "spring boot", "postgresql", "mysql", "mongodb", "redis", "rest apis", "graphql", "microservices", "rabbitmq"],
+    "performance": ["redis", "elasticsearch", "webpack", "kubernetes", "microservices", "react"],
+    "scaling": ["kubernetes", "docker", "aws", "gcp", "azure", "microservices", "redis", "postgresql"],
+    "apis": ["rest apis", "graphql", "fastapi", "django", "node.js"],
+    "portfolio": ["ui/ux design", "figma", "communication"],
+    "storytelling": ["communication", "leadership"],
+    "proposal": ["communication", "problem solving", "agile", "scrum"],
+    "strategy": ["leadership", "problem solving", "agile"],
+    "senior": ["leadership"],
+    "ml": ["pytorch", "tensorflow", "keras", "pandas"],
+}
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9.+#/]*")
+_STOP = {"a", "an", "and", "the", "of", "on", "for", "to", "in", "with", "my", "patterns", "improve"}
+
+
+def tokens(text: str) -> Set[str]:
+    return {t.rstrip(".") for t in _TOKEN.findall(text.lower()) if t not in _STOP}
+
+
+def request_terms(req: Dict) -> Set[str]:
+    """Words of topic + preferred_expertise, expanded to the skills they imply."""
+    words = tokens(req.get("topic", ""))
+    for e in req.get("preferred_expertise", []) or []:
+        words |= tokens(e)
+    terms = set(words)
+    for w in words:
+        terms.update(EXPERTISE_TERMS.get(w, []))
+    return terms
+
+
+def mentor_terms(mentor: Dict) -> Set[str]:
+    """Mentor skills (whole and tokenized) plus industry."""
+    skills = mentor.get("skills", [])
+    if isinstance(skills, str):
+        skills = [s for s in skills.split(";") if s.strip()]
+    terms = set()
+    for s in skills:
+        terms.add(s.strip().lower())
+        terms |= tokens(s)
+    if mentor.get("industry"):
+        terms |= tokens(mentor["industry"])
+    return terms
+
+
+def build_inverted_index(mentors: List[Dict]):
+    """term -> array of mentor positions, and term -> idf."""
+    import numpy as np
+
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for j, m in enumerate(mentors):
+        for t in mentor_terms(m):
+            postings[t].append(j)
+    n = max(1, len(mentors))
+    index = {t: np.asarray(js, dtype=np.int64) for t, js in postings.items()}
+    idf = {t: math.log(1.0 + n / len(js)) for t, js in postings.items()}
+    return index, idf
+
+
+def _score_rows(term_sets: List[frozenset], index, idf, n_mentors: int):
+    """(len(term_sets), n_mentors) idf-weighted overlap, filled from the postings."""
+    import numpy as np
+
+    scores = np.zeros((len(term_sets), n_mentors), dtype=np.float32)
+    for i, terms in enumerate(term_sets):
+        for t in terms:
+            posting = index.get(t)
+            if posting is not None:
+                scores[i, posting] += idf[t]
+    return scores
+
+
+def _remaining_capacity(mentors: List[Dict], capacity: int, load: Optional[Dict[str, int]]):
+    import numpy as np
+
+    cap = np.array([capacity - (load or {}).get(m["id"], 0) for m in mentors], dtype=np.int64)
+    return np.maximum(cap, 0)
+
+
+def match_requests(requests: List[Dict], mentors: List[Dict], capacity: int = DEFAULT_CAPACITY,
+                   top_l: int = 10, block: int = 2048, load: Optional[Dict[str, int]] = None,
+                   fallback: bool = True) -> List[Optional[str]]:
+    """Return the assigned mentor id (or None) for each request.
+
+    Scores are computed per block of distinct request term sets as a dense
+    (block x mentors) array filled from the inverted index, so only shared
+    terms cost work.
+    """
+    import numpy as np
+
+    if not mentors or not requests:
+        return [None] * len(requests)
+    index, idf = build_inverted_index(mentors)
+    cap = _remaining_capacity(mentors, capacity, load)
+
+    # Requests with the same term set share a score row, so score each set once.
+    set_of: Dict[frozenset, int] = {}
+    req_set = np.fromiter((set_of.setdefault(frozenset(request_terms(r)), len(set_of)) for r in requests),
+                          dtype=np.int64, count=len(requests))
+    term_sets = list(set_of)
+
+    L = min(top_l, len(mentors))
+    set_top = np.empty((len(term_sets), L), dtype=np.int64)
+    set_score = np.empty((len(term_sets), L), dtype=np.float32)
+    for start in range(0, len(term_sets), block):
+        chunk = term_sets[start:start + block]
+        scores = _score_rows(chunk, index, idf, len(mentors))
+        top = np.argpartition(-scores, L - 1, axis=1)[:, :L]
+        set_top[start:start + len(chunk)] = top
+        set_score[start:start + len(chunk)] = np.take_along_axis(scores, top, axis=1)
+
+    edge_req = np.repeat(np.arange(len(requests)), L)
+    edge_mentor = set_top[req_set].ravel()
+    edge_score = set_score[req_set].ravel()
+    keep = edge_score > 0
+    edge_req, edge_mentor, edge_score = edge_req[keep], edge_mentor[keep], edge_score[keep]
+    order = np.argsort(-edge_score, kind="stable")
+
+    mentor_ids = [m["id"] for m in mentors]
+    assigned: List[Optional[str]] = [None] * len(requests)
+    for e in order:
+        i, j = int(edge_req[e]), int(edge_mentor[e])
+        if assigned[i] is None and cap[j] > 0 and requests[i].get("requester_id") != mentor_ids[j]:
+            assigned[i] = mentor_ids[j]
+            cap[j] -= 1
+
+    # All requests of a term set share its top-L mentors, which hold only about
+    # L * capacity of them; walk the set's full compatible ranking for the rest.
+    # Mentors never regain capacity, so each set's cursor only moves forward.
+    ranked: Dict[int, np.ndarray] = {}
+    cursor: Dict[int, int] = {}
+    for i in range(len(requests)):
+        if assigned[i] is not None:
+            continue
+        s = int(req_set[i])
+        if s not in ranked:
+            row = _score_rows([term_sets[s]], index, idf, len(mentors))[0]
+            compatible = np.flatnonzero(row > 0)
+            ranked[s] = compatible[np.argsort(-row[compatible], kind="stable")]
+            cursor[s] = 0
+        mentors_s, c = ranked[s], cursor[s]
+        while c < len(mentors_s) and cap[mentors_s[c]] <= 0:
+            c += 1
+        cursor[s] = c
+        for j in mentors_s[c:]:
+            if cap[j] > 0 and requests[i].get("requester_id") != mentor_ids[j]:
+                assigned[i] = mentor_ids[j]
+                cap[j] -= 1
+                break
+
+    if fallback:
+        # Mentors with the most remaining capacity first.
+        heap = [(-int(c), j) for j, c in enumerate(cap) if c > 0]
+        heapq.heapify(heap)
+        for i, req in enumerate(requests):
+            if assigned[i] is not None or not heap:
+                continue
+            skipped = None
+            neg, j = heapq.heappop(heap)
+            if mentor_ids[j] == req.get("requester_id"):
+                if not heap:
+                    heapq.heappush(heap, (neg, j))
+                    continue
+                skipped = (neg, j)
+                neg, j = heapq.heappop(heap)
+            assigned[i] = mentor_ids[j]
+            if neg + 1 < 0:
+                heapq.heappush(heap, (neg + 1, j))
+            if skipped:
+                heapq.heappush(heap, skipped)
+    return assigned
+
+
+def unmatched_compatible(requests: List[Dict], mentors: List[Dict], assigned: List[Optional[str]],
+                         capacity: int = DEFAULT_CAPACITY, load: Optional[Dict[str, int]] = None) -> int:
+    """Unassigned requests that still share a term with some mentor who has room.
+
+    Should be 0 after match_requests: a nonzero count means compatible capacity
+    was left unused.
+    """
+    import numpy as np
+
+    index, _ = build_inverted_index(mentors)
+    cap = _remaining_capacity(mentors, capacity, load)
+    row_of = {m["id"]: j for j, m in enumerate(mentors)}
+    for mentor_id in assigned:
+        if mentor_id is not None:
+            cap[row_of[mentor_id]] -= 1
+    has_room = {m["id"] for m, c in zip(mentors, cap) if c > 0}
+    missed = 0
+    for req, mentor_id in zip(requests, assigned):
+        if mentor_id is not None:
+            continue
+        postings = [index[t] for t in request_terms(req) if t in index]
+        if not postings:
+            continue
+        ids = (mentors[int(j)]["id"] for j in np.unique(np.concatenate(postings)))
+        if any(m in has_room and m != req.get("requester_id") for m in ids):
+            missed += 1
+    return missed
+
+
+def load_mentors(users_path: str, profiles_path: str) -> List[Dict]:
+    with open(users_path, 'r', encoding='utf-8', newline='') as f:
+        users = [u for u in csv.DictReader(f) if str(u.get("is_mentor")).lower() == "true"]
+    with open(profiles_path, 'r', encoding='utf-8', newline='') as f:
+        skills = {p["user_id"]: p.get("skills", "") for p in csv.DictReader(f)}
+    return [{"id": u["id"], "industry": u.get("industry", ""), "skills": skills.get(u["id"], "")} for u in users]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Assign mentors to pending mentorship requests")
+    ap.add_argument("--requests", default="data/processed/mentorship_requests.jsonl")
+    ap.add_argument("--users", default="data/processed/users.csv")
+    ap.add_argument("--profiles", default="data/processed/freelancer_profiles.csv")
+    ap.add_argument("--out", default="data/processed/mentorship_requests.jsonl")
+    ap.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="Max open requests per mentor")
+    ap.add_argument("--top-l", type=int, default=10, help="Candidate mentors kept per request")
+    ap.add_argument("--no-fallback", action="store_true", help="Leave requests without a compatible mentor unassigned")
+    args = ap.parse_args()
+
+    rows = read_jsonl(args.requests)
+    mentors = load_mentors(args.users, args.profiles)
+    load: Dict[str, int] = defaultdict(int)
+    for r in rows:
+        if r.get("status") in ACTIVE_STATUSES and r.get("mentor_id"):
+            load[r["mentor_id"]] += 1
+    pending = [r for r in rows if r.get("status", "pending") == "pending"]
+    assigned = match_requests(pending, mentors, capacity=args.capacity, top_l=args.top_l,
+                              load=load, fallback=not args.no_fallback)
+    for r, mentor_id in zip(pending, assigned):
+        r["mentor_id"] = mentor_id
+
+    write_jsonl(args.out, rows)
+    matched = sum(1 for m in assigned if m)
+    print(f"Matched {matched}/{len(pending)} pending requests across {len(mentors)} mentors -> {args.out}")
+    if args.no_fallback:
+        missed = unmatched_compatible(pending, mentors, assigned, capacity=args.capacity, load=load)
+        print(f"Unassigned with a compatible mentor still free: {missed}")
+
+
+if __name__ == "__main__":
+    main()
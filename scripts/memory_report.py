@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Memory before/after for the compact record layer (utils.ReviewColumns / ProfileColumns).
+
+Loads reviews JSONL and profiles CSV, optionally scaled up with fresh UUIDs and
+timestamps, measures retained memory (tracemalloc) of the plain dict rows vs the
+compact columns, and checks the columns convert back to identical JSONL/CSV
+text. Columns are built from their own freshly parsed rows, so strings they keep
+are counted rather than shared with the measured dicts.
+
+Usage:
+  python scripts/memory_report.py --reviews data/processed/sentiment_reviews_suggested.jsonl --profiles data/processed/freelancer_profiles.csv --repeat 1000
+"""
+import argparse
+import csv
+import gc
+import io
+import json
+import tracemalloc
+from typing import Callable, Dict, List
+
+from utils import ProfileColumns, ReviewColumns, epoch_to_iso, iso_to_epoch, new_uuid
+
+PROFILE_HEADERS = [
+    "user_id", "profile_completeness", "profile_views", "proposal_success_rate",
+    "job_invitations", "hourly_rate", "skills", "portfolio_items", "repeat_clients_rate", "updated_at",
+]
+
+
+def retained(build: Callable):
+    """(object, bytes still allocated after build) measured with tracemalloc."""
+    import numpy  # noqa: F401 - keep the one-off import out of the measurement
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, after - before
+
+
+def jsonl_text(rows: List[Dict]) -> str:
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+
+
+def csv_text(rows: List[Dict]) -> str:
+    buf = io.StringIO()
+    w = csv.DictWriter(buf, fieldnames=PROFILE_HEADERS)
+    w.writeheader()
+    w.writerows(rows)
+    return buf.getvalue()
+
+
+def scaled(lines: List[str], repeat: int, id_keys, ts_key: str) -> List[str]:
+    """Repeat serialized rows, giving each copy fresh UUIDs and distinct timestamps.
+
+    Real ids and timestamps are nearly unique per row; copying them verbatim would
+    let interning look better than it is.
+    """
+    out = list(lines)
+    for copy in range(1, repeat):
+        for j, line in enumerate(lines):
+            row = json.loads(line)
+            for k in id_keys:
+                row[k] = new_uuid()
+            seconds = iso_to_epoch(row.get(ts_key))
+            if seconds is not None:
+                row[ts_key] = epoch_to_iso(seconds - copy * len(lines) - j)
+            out.append(json.dumps(row, ensure_ascii=False))
+    return out
+
+
+def mb(n: int) -> str:
+    return f"{n / 1e6:8.2f} MB"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Measure dict rows vs compact columns memory")
+    ap.add_argument("--reviews", default="data/processed/sentiment_reviews_suggested.jsonl")
+    ap.add_argument("--profiles", default="data/processed/freelancer_profiles.csv")
+    ap.add_argument("--repeat", type=int, default=1000, help="Scale inputs by this factor")
+    args = ap.parse_args()
+
+    with open(args.reviews, 'r', encoding='utf-8') as f:
+        review_lines = scaled([line for line in f if line.strip()], args.repeat, ("id", "user_id"), "created_at")
+    with open(args.profiles, 'r', encoding='utf-8', newline='') as f:
+        profile_lines = scaled([json.dumps(p) for p in csv.DictReader(f)], args.repeat, ("user_id",), "updated_at")
+
+    reviews, r_dict = retained(lambda: [json.loads(line) for line in review_lines])
+    r_cols, r_compact = retained(lambda: ReviewColumns.from_rows([json.loads(line) for line in review_lines]))
+    profiles, p_dict = retained(lambda: [json.loads(line) for line in profile_lines])
+    p_cols, p_compact = retained(lambda: ProfileColumns.from_rows([json.loads(line) for line in profile_lines]))
+
+    assert jsonl_text(r_cols.to_rows()) == jsonl_text(reviews), "review round-trip mismatch"
+    assert csv_text(p_cols.to_rows()) == csv_text(profiles), "profile round-trip mismatch"
+
+    print(f"reviews  ({len(reviews)} rows): dicts {mb(r_dict)}  columns {mb(r_compact)}  "
+          f"x{r_dict / max(1, r_compact):.1f}  (raw fallback rows: {len(r_cols.raw)})")
+    print(f"profiles ({len(profiles)} rows): dicts {mb(p_dict)}  columns {mb(p_compact)}  "
+          f"x{p_dict / max(1, p_compact):.1f}  (raw fallback rows: {len(p_cols.raw)})")
+    print("Round-trip to JSONL/CSV: identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+"""
+Memoized pseudo-ranking (README_API 4.1 / §13 Caching) with targeted invalidation.
+
+Rankings are keyed by (user_id, profile_version, milestone_version) plus the
+milestone counts passed to compute_pseudo_ranking. Versions
+are per-user counters bumped by the change hooks, so a profile or milestone
+edit makes that user's old entries unreachable without touching anyone else's.
+Two tiers:
+  memory  per-process LRU with TTL
+  sqlite  optional on-disk tier shared between processes (WAL mode); it also
+          holds the version counters so every process sees invalidations
+Each process caches version counters in memory. At most once per
+sync_interval seconds a lookup checks PRAGMA data_version, and only if another
+connection has committed since does it re-read a global generation counter;
+cached counters are dropped when that moved, i.e. some process invalidated
+something. Invalidations made through this object apply immediately; ones made
+by other processes are seen within sync_interval (0 checks on every lookup,
+which costs about as much as computing the ranking).
+
+Usage (library):
+  cache = RankingCache("data/processed/cache/rankings.sqlite", maxsize=10000, ttl=3600, sync_interval=0.1)
+  score, breakdown = cache.ranking(profile, milestone_count=2, total_milestones=5)
+  cache.on_profile_changed(user_id)          # or cache.on_event({"type": "profile.updated", "user_id": ...})
+  cache.stats()
+
+Usage (CLI):
+  python scripts/ranking_cache.py stats --db data/processed/cache/rankings.sqlite
+  python scripts/ranking_cache.py invalidate --db data/processed/cache/rankings.sqlite --user-id <uuid> --what milestone
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from utils import compute_pseudo_ranking
+
+PROFILE_EVENTS = {"profile.created", "profile.updated", "profile.deleted"}
+MILESTONE_EVENTS = {"milestone.created", "milestone.updated", "milestone.completed", "milestone.deleted"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    user_id TEXT PRIMARY KEY,
+    profile_version INTEGER NOT NULL DEFAULT 0,
+    milestone_version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS rankings (
+    user_id TEXT NOT NULL,
+    profile_version INTEGER NOT NULL,
+    milestone_version INTEGER NOT NULL,
+    milestone_count INTEGER NOT NULL,
+    total_milestones INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    breakdown TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (user_id, profile_version, milestone_version, milestone_count, total_milestones)
+);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (name, value) VALUES ('generation', 0);
+"""
+_COUNTERS = ("memory_hits", "disk_hits", "misses", "invalidations", "evictions")
+
+
+class RankingCache:
+    """LRU/TTL memory tier over an optional SQLite tier, with per-user version invalidation."""
+
+    def __init__(self, path: Optional[str] = None, maxsize: int = 10000, ttl: Optional[float] = 3600.0,
+                 sync_interval: float = 0.1):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self._synced_at = float("-inf")
+        self._mem: "OrderedDict[tuple, Tuple[float, Tuple[int, Dict[str, float]]]]" = OrderedDict()
+        self._versions: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.RLock()
+        self._stats = dict.fromkeys(_COUNTERS, 0)
+        self._flushed = dict.fromkeys(_COUNTERS, 0)
+        self._db = None
+        self._data_version: Optional[int] = None
+        self._generation: Optional[int] = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    # -- versions / invalidation -------------------------------------------
+
+    def _sync_versions(self, force: bool = False) -> None:
+        """Drop cached version counters if another process invalidated anything."""
+        now = time.monotonic()
+        if not force and now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return
+        self._data_version = data_version
+        generation = self._db.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()[0]
+        if generation != self._generation:
+            self._generation = generation
+            self._versions.clear()
+
+    def versions(self, user_id: str) -> Tuple[int, int]:
+        """Current (profile_version, milestone_version) for user_id."""
+        with self._lock:
+            if self._db is None:
+                return self._versions.get(user_id, (0, 0))
+            self._sync_versions()
+            cached = self._versions.get(user_id)
+            if cached is not None:
+                return cached
+            row = self._db.execute(
+                "SELECT profile_version, milestone_version FROM versions WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            self._versions[user_id] = (row[0], row[1]) if row else (0, 0)
+            return self._versions[user_id]
+
+    def _bump(self, user_id: str, column: str) -> None:
+        with self._lock:
+            self._stats["invalidations"] += 1
+            for key in [k for k in self._mem if k[0] == user_id]:
+                del self._mem[key]
+            if self._db is None:
+                pv, mv = self._versions.get(user_id, (0, 0))
+                self._versions[user_id] = (pv + 1, mv) if column == "profile_version" else (pv, mv + 1)
+                return
+            self._sync_versions(force=True)
+            with self._db:
+                self._db.execute("BEGIN IMMEDIATE")
+                self._db.execute("INSERT OR IGNORE INTO versions (user_id) VALUES (?)", (user_id,))
+                self._db.execute(f"UPDATE versions SET {column} = {column} + 1 WHERE user_id = ?", (user_id,))
+                self._db.execute("DELETE FROM rankings WHERE user_id = ?", (user_id,))
+                self._db.execute("UPDATE meta SET value = value + 1 WHERE name = 'generation'")
+                generation = self._db.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()[0]
+                row = self._db.execute(
+                    "SELECT profile_version, milestone_version FROM versions WHERE user_id = ?", (user_id,)
+                ).fetchone()
+            # Our own commit doesn't move this connection's data_version, so account for
+            # it here; if another process also bumped since the last sync, start over.
+            if generation != self._generation + 1:
+                self._versions.clear()
+            self._generation = generation
+            self._versions[user_id] = (row[0], row[1])
+
+    def on_profile_changed(self, user_id: str) -> None:
+        self._bump(user_id, "profile_version")
+
+    def on_milestone_changed(self, user_id: str) -> None:
+        self._bump(user_id, "milestone_version")
+
+    def on_event(self, event: Dict) -> None:
+        """Route a change event {"type": "profile.updated" | "milestone.completed" | ..., "user_id": ...}."""
+        kind, user_id = event.get("type"), event.get("user_id")
+        if not user_id:
+            return
+        if kind in PROFILE_EVENTS:
+            self.on_profile_changed(user_id)
+        elif kind in MILESTONE_EVENTS:
+            self.on_milestone_changed(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM rankings")
+
+    # -- lookup ---------------------------------------------------------------
+
+    def _fresh(self, created_at: float) -> bool:
+        return self.ttl is None or time.time() - created_at < self.ttl
+
+    def ranking(self, profile: Dict, milestone_count: int, total_milestones: int) -> Tuple[int, Dict[str, float]]:
+        """compute_pseudo_ranking, memoized for the user's current profile/milestone versions."""
+        user_id = str(profile["user_id"])
+        with self._lock:
+            pv, mv = self.versions(user_id)
+            key = (user_id, pv, mv, int(milestone_count), int(total_milestones))
+            hit = self._mem.get(key)
+            if hit is not None and self._fresh(hit[0]):
+                self._mem.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return hit[1]
+
+            value = None
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT score, breakdown, created_at FROM rankings WHERE user_id = ? AND profile_version = ?"
+                    " AND milestone_version = ? AND milestone_count = ? AND total_milestones = ?", key,
+                ).fetchone()
+                if row and self._fresh(row[2]):
+                    value, created_at = (row[0], json.loads(row[1])), row[2]
+                    self._stats["disk_hits"] += 1
+
+            if value is None:
+                self._stats["misses"] += 1
+                value = compute_pseudo_ranking(profile, milestone_count, total_milestones)
+                created_at = time.time()
+                if self._db is not None:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO rankings VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        key + (value[0], json.dumps(value[1]), created_at),
+                    )
+
+            self._mem[key] = (created_at, value)
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+                self._stats["evictions"] += 1
+            return value
+
+    @staticmethod
+    def _with_hit_rate(counts: Dict[str, int]) -> Dict[str, float]:
+        s = dict(counts)
+        lookups = s["memory_hits"] + s["disk_hits"] + s["misses"]
+        s["hit_rate"] = round((s["memory_hits"] + s["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return s
+
+    def stats(self) -> Dict:
+        """This process's counters and hit rate; with SQLite, also totals flushed by all processes."""
+        with self._lock:
+            s = self._with_hit_rate(self._stats)
+            s["memory_entries"] = len(self._mem)
+            if self._db is not None:
+                self.flush_stats()
+                s["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM rankings").fetchone()[0]
+                shared = dict.fromkeys(_COUNTERS, 0)
+                shared.update(self._db.execute("SELECT name, value FROM stats").fetchall())
+                s["shared"] = self._with_hit_rate(shared)
+            return s
+
+    def flush_stats(self) -> None:
+        """Add counters accumulated since the last flush to the shared SQLite totals."""
+        if self._db is None:
+            return
+        with self._lock:
+            for name in _COUNTERS:
+                delta = self._stats[name] - self._flushed[name]
+                if delta:
+                    self._db.execute(
+                        "INSERT INTO stats (name, value) VALUES (?, ?)"
+                        " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, delta),
+                    )
+                    self._flushed[name] = self._stats[name]
+
+    def close(self) -> None:
+        if self._db is not None:
+            self.flush_stats()
+            self._db.close()
+            self._db = None
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspect or invalidate the shared ranking cache")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("stats")
+    s.add_argument("--db", default="data/processed/cache/rankings.sqlite")
+    i = sub.add_parser("invalidate")
+    i.add_argument("--db", default="data/processed/cache/rankings.sqlite")
+    i.add_argument("--user-id", required=True)
+    i.add_argument("--what", choices=["profile", "milestone"], required=True)
+    args = ap.parse_args()
+
+    cache = RankingCache(args.db)
+    if args.cmd == "invalidate":
+        if args.what == "profile":
+            cache.on_profile_changed(args.user_id)
+        else:
+            cache.on_milestone_changed(args.user_id)
+        print(f"Invalidated {args.what} rankings for {args.user_id}: versions now {cache.versions(args.user_id)}")
+    else:
+        print(json.dumps(cache.stats(), indent=2))
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
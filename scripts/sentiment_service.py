@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""
+Long-lived local sentiment service mirroring README_API 4.2
+`sentiment_service.analyze_text(text) -> {score, label, categories, suggestions}`.
+
+Keeps VADER and the zero-shot model loaded, and coalesces concurrent requests
+into micro-batches: the worker waits up to --max-wait-ms (or until --max-batch
+texts are queued) and runs the zero-shot model once per batch.
+
+Usage:
+  python scripts/sentiment_service.py --port 8765
+  curl -s localhost:8765/analyze -d '{"text": "Missed a deadline but good quality"}'
+  curl -s localhost:8765/analyze -d '{"texts": ["Great work", "Slow replies"]}'
+
+Endpoints:
+  POST /analyze  {"text": str} -> result, or {"texts": [str]} -> [result]
+  GET  /health   -> {"status": "ok", "batches": int, "items": int}
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from enrich_sentiment import enrich
+from generate_suggestions import suggest
+from utils import get_vader
+
+
+class MicroBatcher:
+    """Queue texts from many threads and analyze them in batches on one worker thread."""
+
+    def __init__(self, nlp=None, threshold: float = 0.4, max_batch: int = 16, max_wait_ms: float = 10.0):
+        self.nlp = nlp
+        self.threshold = threshold
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.batches = 0
+        self.items = 0
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="sentiment-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        fut: Future = Future()
+        self._queue.put((text, fut))
+        return fut
+
+    def analyze_text(self, text: str, timeout: Optional[float] = None) -> Dict:
+        return self.submit(text).result(timeout=timeout)
+
+    def analyze_many(self, texts: List[str], timeout: Optional[float] = None) -> List[Dict]:
+        futs = [self.submit(t) for t in texts]
+        return [f.result(timeout=timeout) for f in futs]
+
+    def _collect(self) -> List[tuple]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                results = self.process([text for text, _ in batch])
+            except Exception as e:  # surface model errors to every waiting caller
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, fut), res in zip(batch, results):
+                fut.set_result(res)
+
+    def process(self, texts: List[str]) -> List[Dict]:
+        """enrich + zero-shot tagging + suggestions, as the batch pipeline does."""
+        rows = [enrich({"text": t}) for t in texts]
+        if self.nlp is not None:
+            from tag_categories_zeroshot import zeroshot_labels
+
+            tags = zeroshot_labels(self.nlp, texts, self.threshold, batch_size=len(texts))
+            for r, keep in zip(rows, tags):
+                r["categories"] = sorted(set(r["categories"] + keep))
+        for r in rows:  # with or without zero-shot, suggestions come from generate_suggestions
+            r["suggestions"] = suggest(r["label"], r["categories"])
+        return [
+            {k: r[k] for k in ("score", "label", "categories", "suggestions")}
+            for r in rows
+        ]
+
+
+class SentimentHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 resets connections under concurrent bursts.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def make_handler(batcher: MicroBatcher, timeout: float):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code: int, payload) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path != "/health":
+                return self._send(404, {"error": "not found"})
+            self._send(200, {"status": "ok", "batches": batcher.batches, "items": batcher.items})
+
+        def do_POST(self):
+            if self.path != "/analyze":
+                return self._send(404, {"error": "not found"})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                data = json.loads(self.rfile.read(length) or b"{}")
+            except (ValueError, json.JSONDecodeError):
+                return self._send(400, {"error": "invalid JSON"})
+            if not isinstance(data, dict):
+                return self._send(400, {"error": "expected a JSON object"})
+            texts, text = data.get("texts"), data.get("text")
+            if "texts" in data:
+                if not (isinstance(texts, list) and all(isinstance(t, str) for t in texts)):
+                    return self._send(400, {"error": "'texts' must be a list of strings"})
+            elif not isinstance(text, str):
+                return self._send(400, {"error": "expected 'text' (string) or 'texts' (list of strings)"})
+            try:
+                if "texts" in data:
+                    return self._send(200, batcher.analyze_many(texts, timeout=timeout))
+                return self._send(200, batcher.analyze_text(text, timeout=timeout))
+            except Exception as e:
+                return self._send(500, {"error": str(e)})
+
+        def log_message(self, fmt, *args):  # keep stdout quiet under load
+            pass
+
+    return Handler
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve warm sentiment analysis with micro-batching")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--model", default="facebook/bart-large-mnli")
+    ap.add_argument("--threshold", type=float, default=0.4)
+    ap.add_argument("--max-batch", type=int, default=16)
+    ap.add_argument("--max-wait-ms", type=float, default=10.0)
+    ap.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    ap.add_argument("--no-zeroshot", action="store_true", help="Serve VADER + keyword categories only")
+    args = ap.parse_args()
+
+    # Warm everything before accepting traffic.
+    get_vader()
+    nlp = None
+    if not args.no_zeroshot:
+        from tag_categories_zeroshot import load_zeroshot
+
+        nlp = load_zeroshot(args.model)
+
+    batcher = MicroBatcher(nlp, threshold=args.threshold, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    server = SentimentHTTPServer((args.host, args.port), make_handler(batcher, args.timeout))
+    print(f"Sentiment service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python
+"""
+Skill-similarity index over freelancer profiles: "most similar freelancers" for
+the Suggestions feature and real peers for comparison snapshots.
+
+Skills are interned into integer ids and stored as per-profile bitsets; numeric
+metrics are min-max normalized. Candidates come from MinHash LSH buckets over
+the skill sets: per band, rows are sorted by bucket key and then by a random
+projection of their metrics, and a profile's candidates are the bucket-mates
+within a small window of it (no full scan). They are ranked by
+  score = alpha * jaccard(skills) + (1 - alpha) * (1 - metric_distance)
+with metric_distance the Euclidean distance of normalized metrics / sqrt(d).
+Results are approximate; top_k and the bulk top_k_all share the same candidates,
+so both return the same peers. The index persists to a single .npz file.
+
+Usage:
+  python scripts/similarity_index.py build --profiles data/processed/freelancer_profiles.csv --index data/processed/cache/skill_index.npz
+  python scripts/similarity_index.py query --index data/processed/cache/skill_index.npz --user-id <uuid> --k 5
+  python scripts/similarity_index.py comparisons --index data/processed/cache/skill_index.npz --profiles data/processed/freelancer_profiles.csv --out data/processed/comparisons.jsonl
+"""
+import argparse
+import csv
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from dedupe_reviews import MinHashLSH
+from utils import compute_pseudo_ranking, new_uuid, now_iso, write_jsonl
+
+METRICS = [
+    "profile_completeness", "profile_views", "proposal_success_rate", "job_invitations",
+    "hourly_rate", "portfolio_items", "repeat_clients_rate",
+]
+# Signature input for profiles without any skills, so they share their own bucket.
+_NO_SKILLS = (1 << 31) - 2
+_SCORE_LEVELS = (1 << 20) - 1
+# Bucket-mates considered on either side of a profile, per band.
+DEFAULT_WINDOW = 8
+SNAPSHOT_FIELDS = [
+    "profile_completeness", "proposal_success_rate", "portfolio_items", "hourly_rate", "repeat_clients_rate",
+]
+
+
+def split_skills(skills) -> List[str]:
+    """Profiles carry skills as a ';'-joined CSV string or as a list."""
+    if isinstance(skills, str):
+        return [s.strip() for s in skills.split(";") if s.strip()]
+    return [str(s).strip() for s in (skills or []) if str(s).strip()]
+
+
+def read_profiles(path: str) -> List[Dict]:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+class SkillIndex:
+    """Top-k similar-profile search over interned skill bitsets + normalized metrics."""
+
+    def __init__(self, user_ids, vocab, bits, metrics, lo, hi, sigs,
+                 num_perm: int = 64, bands: int = 32, seed: int = 42):
+        import numpy as np
+
+        self.user_ids = list(user_ids)
+        self.vocab = list(vocab)
+        self.skill_ids = {s: i for i, s in enumerate(self.vocab)}
+        self.row_of = {u: i for i, u in enumerate(self.user_ids)}
+        self.bits = bits
+        self.metrics = metrics
+        self.lo, self.hi = lo, hi
+        self.sigs = sigs
+        self.num_perm, self.bands, self.seed = num_perm, bands, seed
+        self.lsh = MinHashLSH(num_perm=num_perm, bands=bands, seed=seed)
+        self.sizes = np.bitwise_count(bits).sum(axis=1).astype(np.int32)
+        self._build_bands()
+
+    # -- construction -------------------------------------------------------
+
+    @classmethod
+    def from_profiles(cls, profiles: List[Dict], num_perm: int = 64, bands: int = 32, seed: int = 42) -> "SkillIndex":
+        import numpy as np
+
+        vocab: Dict[str, int] = {}
+        skill_sets = []
+        for p in profiles:
+            skill_sets.append({vocab.setdefault(s.lower(), len(vocab)) for s in split_skills(p.get("skills"))})
+        words = max(1, (len(vocab) + 63) // 64)
+        bits = np.zeros((len(profiles), words), dtype=np.uint64)
+        for i, ids in enumerate(skill_sets):
+            for sid in ids:
+                bits[i, sid >> 6] |= np.uint64(1) << np.uint64(sid & 63)
+
+        raw = np.array([[float(p.get(m) or 0) for m in METRICS] for p in profiles], dtype=np.float32)
+        raw = raw.reshape(len(profiles), len(METRICS))
+        lo = raw.min(axis=0) if len(profiles) else np.zeros(len(METRICS), dtype=np.float32)
+        hi = raw.max(axis=0) if len(profiles) else np.ones(len(METRICS), dtype=np.float32)
+        metrics = (raw - lo) / np.where(hi > lo, hi - lo, 1.0)
+
+        lsh = MinHashLSH(num_perm=num_perm, bands=bands, seed=seed)
+        sigs = np.empty((len(profiles), num_perm), dtype=np.uint32)
+        for i, ids in enumerate(skill_sets):
+            sigs[i] = lsh.signature(ids or {_NO_SKILLS})
+        return cls([p["user_id"] for p in profiles], sorted(vocab, key=vocab.get), bits,
+                   metrics.astype(np.float32), lo, hi, sigs, num_perm=num_perm, bands=bands, seed=seed)
+
+    def _band_keys(self, sigs):
+        import numpy as np
+
+        # Collapse each band's rows into one uint64 key (wrapping polynomial hash).
+        banded = sigs.reshape(sigs.shape[0], self.bands, self.lsh.rows).astype(np.uint64)
+        mult = np.uint64(0x9E3779B97F4A7C15)
+        keys = np.zeros((sigs.shape[0], self.bands), dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for r in range(self.lsh.rows):
+                keys = keys * mult + banded[:, :, r]
+        return keys
+
+    def _build_bands(self) -> None:
+        import numpy as np
+
+        # Within a bucket, rows are ordered by a seeded random projection of their
+        # metrics (a different one per band), so a row's neighbours in that order are
+        # metric-close bucket-mates rather than whichever rows were indexed first.
+        n = len(self.user_ids)
+        self._keys = self._band_keys(self.sigs)
+        dirs = np.random.default_rng(self.seed).normal(size=(len(METRICS), self.bands)).astype(np.float32)
+        proj = self.metrics.reshape(n, len(METRICS)) @ dirs
+        self._order = np.empty((n, self.bands), dtype=np.int64)
+        self._pos = np.empty((n, self.bands), dtype=np.int64)
+        for b in range(self.bands):
+            self._order[:, b] = np.lexsort((proj[:, b], self._keys[:, b]))
+            self._pos[self._order[:, b], b] = np.arange(n)
+        self._sorted = np.take_along_axis(self._keys, self._order, axis=0)
+
+    # -- persistence --------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        import numpy as np
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(
+            path, user_ids=np.array(self.user_ids), vocab=np.array(self.vocab, dtype=str),
+            bits=self.bits, metrics=self.metrics, lo=self.lo, hi=self.hi, sigs=self.sigs,
+            params=np.array([self.num_perm, self.bands, self.seed]),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "SkillIndex":
+        import numpy as np
+
+        d = np.load(path)
+        num_perm, bands, seed = (int(x) for x in d["params"])
+        return cls([str(u) for u in d["user_ids"]], [str(s) for s in d["vocab"]], d["bits"],
+                   d["metrics"], d["lo"], d["hi"], d["sigs"], num_perm=num_perm, bands=bands, seed=seed)
+
+    # -- search -------------------------------------------------------------
+
+    def _window(self, row: int, window: int):
+        """Up to `window` bucket-mates on either side of row in each band's sorted order."""
+        import numpy as np
+
+        found = []
+        for b in range(self.bands):
+            p = int(self._pos[row, b])
+            lo, hi = max(0, p - window), min(len(self.user_ids), p + window + 1)
+            same = self._sorted[lo:hi, b] == self._keys[row, b]
+            found.append(self._order[lo:hi, b][same])
+        cand = np.unique(np.concatenate(found))
+        return cand[cand != row]
+
+    def candidates(self, row: int, window: int = DEFAULT_WINDOW):
+        """Rows sharing an LSH band bucket with row and near it in that band's metric order.
+
+        This is the candidate set top_k_all builds for every row at once; with no
+        bucket-mates at all, fall back to every other row.
+        """
+        import numpy as np
+
+        cand = self._window(row, window)
+        if not len(cand):
+            cand = np.delete(np.arange(len(self.user_ids), dtype=np.int64), row)
+        return cand
+
+    def pair_scores(self, src, dst, alpha: float = 0.7, block: int = 262144):
+        """Similarity of profile rows src[i] and dst[i], computed in bounded blocks."""
+        import numpy as np
+
+        out = np.empty(len(src), dtype=np.float32)
+        norm = np.sqrt(len(METRICS))
+        for i in range(0, len(src), block):
+            a, b = src[i:i + block], dst[i:i + block]
+            inter = np.bitwise_count(self.bits[a] & self.bits[b]).sum(axis=1)
+            union = self.sizes[a] + self.sizes[b] - inter
+            jac = np.where(union > 0, inter / np.maximum(union, 1), 0.0)
+            dist = np.linalg.norm(self.metrics[a] - self.metrics[b], axis=1) / norm
+            out[i:i + block] = alpha * jac + (1.0 - alpha) * (1.0 - dist)
+        return out
+
+    def score(self, row: int, cand, alpha: float = 0.7):
+        import numpy as np
+
+        return self.pair_scores(np.full(len(cand), row, dtype=np.int64), cand, alpha)
+
+    def top_k_row(self, row: int, k: int = 5, alpha: float = 0.7,
+                  window: int = DEFAULT_WINDOW) -> List[Tuple[str, float]]:
+        import numpy as np
+
+        cand = self.candidates(row, window)
+        if not len(cand):
+            return []
+        s = self.score(row, cand, alpha)
+        q = np.round(np.clip(s, 0.0, 1.0) * _SCORE_LEVELS).astype(np.int64)
+        top = np.argsort(-q, kind="stable")[:k]
+        return [(self.user_ids[int(cand[i])], round(float(s[i]), 4)) for i in top]
+
+    def top_k(self, user_id: str, k: int = 5, alpha: float = 0.7,
+              window: int = DEFAULT_WINDOW) -> List[Tuple[str, float]]:
+        """Most similar other profiles to user_id as (user_id, score), best first.
+
+        Approximate: only candidates() are scored, so a better peer outside the
+        windows can be missed.
+        """
+        return self.top_k_row(self.row_of[user_id], k, alpha, window)
+
+    def top_k_all(self, k: int = 1, alpha: float = 0.7, window: int = DEFAULT_WINDOW, band_block: int = 8):
+        """Yield (user_id, [(peer_id, score), ...]) for every indexed profile.
+
+        Same candidates and ranking as top_k, computed in bulk: in each band, a
+        profile is paired with up to `window` neighbours on either side within its
+        bucket. Pairs from each block of bands are deduplicated, scored vectorized
+        and merged into a running top-k, so the cost is O(n * bands * window)
+        instead of a per-row search.
+        """
+        import numpy as np
+
+        n = len(self.user_ids)
+        best_ids = np.full((n, k), -1, dtype=np.int64)
+        best_sc = np.full((n, k), -np.inf, dtype=np.float32)
+        carry_src = np.repeat(np.arange(n, dtype=np.int64), k)
+        for b0 in range(0, self.bands, band_block):
+            src_parts, dst_parts = [carry_src], [best_ids.ravel()]
+            for b in range(b0, min(b0 + band_block, self.bands)):
+                order, keys = self._order[:, b], self._sorted[:, b]
+                for o in range(1, window + 1):
+                    same = keys[o:] == keys[:-o]
+                    left, right = order[:-o][same], order[o:][same]
+                    src_parts += [left, right]
+                    dst_parts += [right, left]
+            src, dst = np.concatenate(src_parts), np.concatenate(dst_parts)
+            pair = np.sort((src * n + dst)[dst >= 0])  # by (src, dst); sort + mask beats np.unique
+            pair = pair[np.r_[True, pair[1:] != pair[:-1]]]
+            src, dst = pair // n, pair % n
+            sc = self.pair_scores(src, dst, alpha)
+
+            # One int64 argsort: row-major, best (quantized) score first within a row,
+            # ties to the lower peer row as in top_k_row.
+            q = np.round(np.clip(sc, 0.0, 1.0) * _SCORE_LEVELS).astype(np.int64)
+            by_row = np.argsort(src * (_SCORE_LEVELS + 1) + (_SCORE_LEVELS - q), kind="stable")
+            src, dst, sc = src[by_row], dst[by_row], sc[by_row]
+            starts = np.flatnonzero(np.r_[True, src[1:] != src[:-1]])
+            rank = np.arange(len(src)) - np.repeat(starts, np.diff(np.r_[starts, len(src)]))
+            keep = rank < k
+            best_ids[src[keep], rank[keep]] = dst[keep]
+            best_sc[src[keep], rank[keep]] = sc[keep]
+
+        for row in np.flatnonzero(best_ids[:, 0] < 0):  # no bucket-mates: exact scan
+            for rank, (peer, s) in enumerate(self.top_k_row(int(row), k, alpha, window)):
+                best_ids[row, rank], best_sc[row, rank] = self.row_of[peer], s
+
+        for row in range(n):
+            yield self.user_ids[row], [
+                (self.user_ids[int(j)], round(float(s), 4))
+                for j, s in zip(best_ids[row], best_sc[row]) if j >= 0
+            ]
+
+
+def comparison_row(profile: Dict, peer_id: Optional[str], milestone_count: int = 2, total_milestones: int = 5,
+                   role: str = "frontend", cache=None) -> Dict:
+    """ComparisonEntry payload (README_API 3.5) against a real peer profile.
+
+    competitor_identifier is None when there is no peer (a single-profile index).
+    Pass a ranking_cache.RankingCache as `cache` to reuse memoized rankings.
+    """
+    rank = cache.ranking if cache is not None else compute_pseudo_ranking
+    score, _ = rank(profile, milestone_count, total_milestones)
+    return {
+        "id": new_uuid(),
+        "user_id": profile["user_id"],
+        "competitor_identifier": f"profile:{peer_id}" if peer_id else None,
+        "competitor_role": role,
+        "pseudo_ranking": score,
+        "snapshot": {f: int(float(profile.get(f) or 0)) for f in SNAPSHOT_FIELDS},
+        "created_at": now_iso(),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build and query the freelancer skill-similarity index")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    b = sub.add_parser("build")
+    b.add_argument("--profiles", default="data/processed/freelancer_profiles.csv")
+    b.add_argument("--index", default="data/processed/cache/skill_index.npz")
+    b.add_argument("--num-perm", type=int, default=64)
+    b.add_argument("--bands", type=int, default=32)
+    b.add_argument("--seed", type=int, default=42)
+
+    q = sub.add_parser("query")
+    q.add_argument("--index", default="data/processed/cache/skill_index.npz")
+    q.add_argument("--user-id", required=True)
+    q.add_argument("--k", type=int, default=5)
+    q.add_argument("--alpha", type=float, default=0.7, help="Weight of skill Jaccard vs metric closeness")
+    q.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Bucket-mates scanned per side per band")
+
+    c = sub.add_parser("comparisons")
+    c.add_argument("--index", default="data/processed/cache/skill_index.npz")
+    c.add_argument("--profiles", default="data/processed/freelancer_profiles.csv")
+    c.add_argument("--out", default="data/processed/comparisons.jsonl")
+    c.add_argument("--alpha", type=float, default=0.7)
+    c.add_argument("--window", type=int, default=DEFAULT_WINDOW)
+    c.add_argument("--ranking-cache", default=None, help="SQLite ranking cache shared with other processes")
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        profiles = read_profiles(args.profiles)
+        idx = SkillIndex.from_profiles(profiles, num_perm=args.num_perm, bands=args.bands, seed=args.seed)
+        idx.save(args.index)
+        print(f"Indexed {len(profiles)} profiles, {len(idx.vocab)} skills -> {args.index}")
+    elif args.cmd == "query":
+        idx = SkillIndex.load(args.index)
+        print(json.dumps([{"user_id": u, "score": s} for u, s in idx.top_k(args.user_id, args.k, args.alpha, args.window)], indent=2))
+    else:
+        idx = SkillIndex.load(args.index)
+
+        profiles = {p["user_id"]: p for p in read_profiles(args.profiles)}
+        cache = None
+        if args.ranking_cache:
+            from ranking_cache import RankingCache
+
+            cache = RankingCache(args.ranking_cache)
+
+        def rows():
+            for user_id, peers in idx.top_k_all(1, args.alpha, args.window):
+                if user_id in profiles:
+                    yield comparison_row(profiles[user_id], peers[0][0] if peers else None, cache=cache)
+
+        write_jsonl(args.out, rows())
+        print(f"Wrote comparisons -> {args.out}")
+        if cache is not None:
+            print(f"Ranking cache: {cache.stats()}")
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
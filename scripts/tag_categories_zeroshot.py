@@ -8,11 +8,21 @@ Usage:
 
 Requires: transformers, torch, sentencepiece
 Model: facebook/bart-large-mnli (default) – CPU OK, small batch.
+
+--mode embedding swaps NLI for the much faster embedding tagger
+(see embedding_tagger.py); --model then names a sentence-transformers model.
+
+--backend picks how the NLI model runs:
+  fp32  plain transformers pipeline (reference)
+  int8  torch dynamic int8 quantization of the Linear layers
+  onnx  exported ONNX graph on onnxruntime's CPUExecutionProvider (needs optimum[onnxruntime])
+int8/onnx models are built once and cached under --cache-dir. Add --parity N to
+report label agreement of the chosen backend vs fp32 on the first N reviews.
 """
 import argparse
 import os
-
-from transformers import pipeline
+import re
+from typing import Dict, List, Optional
 
 from utils import read_jsonl, write_jsonl
 
@@ -21,24 +31,219 @@ LABELS = [
 ]
 
 
+BACKENDS = ["fp32", "int8", "onnx"]
+DEFAULT_CACHE_DIR = "data/processed/cache"
+
+
+def _backend_dir(cache_dir: str, model: str, backend: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model)
+    return os.path.join(cache_dir, "zeroshot", f"{slug}-{backend}")
+
+
+def _int8_tensors(q) -> Dict:
+    """Plain-tensor form of a dynamically quantized model's weights.
+
+    Quantized tensors are stored as int8 values + scale + zero point: pickling them
+    directly makes pickle search sys.modules for torch.per_tensor_affine, which can
+    trip lazy-importing packages such as transformers.
+    """
+    import torch
+    from torch.ao.nn.quantized.dynamic import Linear as QLinear
+
+    out = {k: v.detach() for k, v in [*q.named_parameters(), *q.named_buffers()]}
+    for name, mod in q.named_modules():
+        if isinstance(mod, QLinear):
+            w = mod.weight()
+            out[f"{name}.weight_int8"] = w.int_repr()
+            out[f"{name}.weight_scale"] = torch.tensor(w.q_scale(), dtype=torch.float64)
+            out[f"{name}.weight_zero_point"] = torch.tensor(w.q_zero_point())
+            if mod.bias() is not None:
+                out[f"{name}.weight_bias"] = mod.bias().detach()
+    return out
+
+
+def _load_int8_tensors(q, tensors: Dict) -> None:
+    import torch
+    from torch.ao.nn.quantized.dynamic import Linear as QLinear
+
+    tensors = dict(tensors)
+    for name, mod in q.named_modules():
+        if isinstance(mod, QLinear):
+            scale = float(tensors.pop(f"{name}.weight_scale"))
+            zero_point = int(tensors.pop(f"{name}.weight_zero_point"))
+            ints = tensors.pop(f"{name}.weight_int8")
+            w = torch.quantize_per_tensor((ints.float() - zero_point) * scale, scale, zero_point, torch.qint8)
+            mod.set_weight_bias(w, tensors.pop(f"{name}.weight_bias", None))
+    with torch.no_grad():
+        for name, t in [*q.named_parameters(), *q.named_buffers()]:
+            if name not in tensors:
+                raise ValueError(f"int8 cache does not match the model: no tensor for {name}")
+            t.copy_(tensors.pop(name))
+    if tensors:
+        raise ValueError(f"int8 cache does not match the model: unused tensors {sorted(tensors)[:5]}")
+
+
+def _load_int8(model: str, path: str):
+    import torch
+    from torch.ao.quantization import quantize_dynamic
+    from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+
+    def quantize(m):
+        return quantize_dynamic(m.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+    # Only plain tensors are cached: the quantized module is rebuilt from the saved
+    # config and the tensors loaded with weights_only=True, so the cache never
+    # unpickles code. The weights file is written last and marks a complete cache.
+    weights = os.path.join(path, "model_int8_tensors.pt")
+    if os.path.exists(weights):
+        q = quantize(AutoModelForSequenceClassification.from_config(AutoConfig.from_pretrained(path)))
+        _load_int8_tensors(q, torch.load(weights, weights_only=True))
+        return q, AutoTokenizer.from_pretrained(path)
+    tok = AutoTokenizer.from_pretrained(model)
+    fp32 = AutoModelForSequenceClassification.from_pretrained(model)
+    q = quantize(fp32)
+    os.makedirs(path, exist_ok=True)
+    fp32.config.save_pretrained(path)
+    tok.save_pretrained(path)
+    torch.save(_int8_tensors(q), weights + ".tmp")
+    os.replace(weights + ".tmp", weights)
+    return q, tok
+
+
+def _load_onnx(model: str, path: str):
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+    except ImportError as e:
+        raise SystemExit("--backend onnx requires: pip install optimum[onnxruntime]") from e
+    from transformers import AutoTokenizer
+
+    if os.path.exists(os.path.join(path, "model.onnx")):
+        ort = ORTModelForSequenceClassification.from_pretrained(path, provider="CPUExecutionProvider")
+        return ort, AutoTokenizer.from_pretrained(path)
+    ort = ORTModelForSequenceClassification.from_pretrained(model, export=True, provider="CPUExecutionProvider")
+    tok = AutoTokenizer.from_pretrained(model)
+    os.makedirs(path, exist_ok=True)
+    ort.save_pretrained(path)
+    tok.save_pretrained(path)
+    return ort, tok
+
+
+def load_zeroshot(model: str, backend: str = "fp32", cache_dir: str = DEFAULT_CACHE_DIR):
+    """Build the zero-shot pipeline on CPU for the given backend."""
+    # Deferred: importing transformers/torch takes seconds, and --help shouldn't pay it.
+    from transformers import pipeline
+
+    if backend == "fp32":
+        return pipeline("zero-shot-classification", model=model, device=-1)
+    path = _backend_dir(cache_dir, model, backend)
+    if backend == "int8":
+        m, tok = _load_int8(model, path)
+    elif backend == "onnx":
+        m, tok = _load_onnx(model, path)
+    else:
+        raise ValueError(f"unknown backend: {backend}")
+    return pipeline("zero-shot-classification", model=m, tokenizer=tok, device=-1)
+
+
+def zeroshot_labels(nlp, texts: List[str], threshold: float, batch_size: Optional[int] = None) -> List[List[str]]:
+    """Return the LABELS scoring >= threshold for each text, in one pipeline call.
+
+    batch_size is forwarded to the pipeline (its own default is 1, i.e. one
+    forward pass per (text, label) pair); it defaults to len(texts).
+    """
+    if not texts:
+        return []
+    results = nlp([t[:1000] for t in texts], LABELS, multi_label=True, batch_size=batch_size or len(texts))
+    if isinstance(results, dict):
+        results = [results]
+    return [
+        [lbl for lbl, score in zip(res["labels"], res["scores"]) if score >= threshold]
+        for res in results
+    ]
+
+
+def parity_report(reference: List[List[str]], candidate: List[List[str]]) -> Dict[str, float]:
+    """Label agreement of a backend's tags vs the fp32 reference."""
+    n = max(1, len(reference))
+    exact = sum(set(a) == set(b) for a, b in zip(reference, candidate))
+    per_label = sum(
+        (lbl in a) == (lbl in b) for a, b in zip(reference, candidate) for lbl in LABELS
+    )
+    return {
+        "n_reviews": len(reference),
+        "exact_agreement": round(exact / n, 4),
+        "label_agreement": round(per_label / (n * len(LABELS)), 4),
+    }
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--in", dest="in_path", default="data/processed/sentiment_reviews.jsonl")
     ap.add_argument("--out", dest="out_path", default="data/processed/sentiment_reviews.jsonl")
-    ap.add_argument("--model", default="facebook/bart-large-mnli")
-    ap.add_argument("--threshold", type=float, default=0.4)
+    ap.add_argument("--mode", choices=["nli", "embedding"], default="nli")
+    ap.add_argument("--model", default=None, help="Defaults to facebook/bart-large-mnli (nli) or all-MiniLM-L6-v2 (embedding)")
+    ap.add_argument("--threshold", type=float, default=None, help="Defaults to 0.4 (nli) or 0.45 (embedding)")
+    ap.add_argument("--batch-size", type=int, default=16)
+    ap.add_argument("--backend", choices=BACKENDS, default="fp32", help="NLI inference backend (nli mode only)")
+    ap.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    ap.add_argument("--per-cluster", action="store_true",
+                    help="Tag only cluster representatives (see dedupe_reviews.py) and copy to their cluster")
+    ap.add_argument("--parity", type=int, default=0, metavar="N",
+                    help="Compare --backend against fp32 on the first N reviews and print agreement")
     args = ap.parse_args()
 
+    if args.mode == "embedding" and (args.backend != "fp32" or args.parity):
+        ap.error("--backend and --parity apply to --mode nli only")
+    if args.parity and args.backend == "fp32":
+        ap.error("--parity compares --backend int8/onnx against fp32; pick one of those backends")
+
     rows = read_jsonl(args.in_path)
-    nlp = pipeline("zero-shot-classification", model=args.model, device=-1)
+    if args.mode == "embedding":
+        from embedding_tagger import DEFAULT_MODEL, EmbeddingTagger
+
+        tagger = EmbeddingTagger(args.model or DEFAULT_MODEL, cache_dir=args.cache_dir)
+        threshold = 0.45 if args.threshold is None else args.threshold
+
+        def tag_batch(texts):
+            return tagger.tag(texts, threshold)
+    else:
+        model = args.model or "facebook/bart-large-mnli"
+        nlp = load_zeroshot(model, args.backend, args.cache_dir)
+        threshold = 0.4 if args.threshold is None else args.threshold
+        if args.parity:
+            sample = [r.get("text", "") for r in rows[: args.parity]]
+            ref_nlp = load_zeroshot(model, "fp32")
+            ref, cand = [], []
+            for i in range(0, len(sample), args.batch_size):
+                ref.extend(zeroshot_labels(ref_nlp, sample[i:i + args.batch_size], threshold, args.batch_size))
+                cand.extend(zeroshot_labels(nlp, sample[i:i + args.batch_size], threshold, args.batch_size))
+            del ref_nlp
+            report = parity_report(ref, cand)
+            print(f"Parity {args.backend} vs fp32: {report}")
+
+        def tag_batch(texts):
+            return zeroshot_labels(nlp, texts, threshold, args.batch_size)
+
+    # With --per-cluster, each near-duplicate cluster is tagged once via its representative.
+    def key(i):
+        if args.per_cluster and "cluster_id" in rows[i]:
+            return ("cluster", rows[i]["cluster_id"])
+        return i
+
+    todo, seen = [], set()
+    for i in range(len(rows)):
+        if key(i) not in seen:
+            seen.add(key(i))
+            todo.append(i)
+    tags = {}
+    for start in range(0, len(todo), args.batch_size):
+        batch = todo[start:start + args.batch_size]
+        for i, keep in zip(batch, tag_batch([rows[i].get("text", "") for i in batch])):
+            tags[key(i)] = keep
 
     out = []
-    for r in rows:
-        text = r.get("text", "")[:1000]
-        res = nlp(text, LABELS, multi_label=True)
-        keep = [lbl for lbl, score in zip(res["labels"], res["scores"]) if score >= args.threshold]
-        merged = sorted(set(r.get("categories", []) + keep))
-        r["categories"] = merged
+    for i, r in enumerate(rows):
+        r["categories"] = sorted(set(r.get("categories", []) + tags[key(i)]))
         out.append(r)
 
     os.makedirs(os.path.dirname(args.out_path), exist_ok=True)
@@ -2,16 +2,8 @@ import json
 import os
 import uuid
 from datetime import datetime, timezone
-from typing import Dict, Iterable, List, Tuple
-
-import numpy as np
-
-try:
-    import nltk
-    from nltk.sentiment import SentimentIntensityAnalyzer
-except Exception:  # pragma: no cover - optional at runtime
-    nltk = None
-    SentimentIntensityAnalyzer = None
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 
 ISO_FMT = "%Y-%m-%dT%H:%M:%SZ"
@@ -21,6 +13,21 @@ def now_iso() -> str:
     return datetime.now(timezone.utc).strftime(ISO_FMT)
 
 
+def iso_to_epoch(value: Any) -> Optional[int]:
+    """Epoch seconds of an ISO_FMT timestamp, None if it wouldn't round-trip."""
+    if not isinstance(value, str) or len(value) != 20:
+        return None
+    try:
+        seconds = int(datetime.strptime(value, ISO_FMT).replace(tzinfo=timezone.utc).timestamp())
+    except ValueError:
+        return None
+    return seconds if epoch_to_iso(seconds) == value else None
+
+
+def epoch_to_iso(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime(ISO_FMT)
+
+
 def clamp(x: float, lo: float, hi: float) -> float:
     return float(max(lo, min(hi, x)))
 
@@ -52,7 +59,9 @@ def compute_pseudo_ranking(profile: Dict, milestone_count: int, total_milestones
 
 def ensure_vader() -> None:
     """Ensure VADER lexicon is available for NLTK sentiment."""
-    if nltk is None:
+    try:
+        import nltk
+    except Exception:  # pragma: no cover - optional at runtime
         return
     try:
         nltk.data.find('sentiment/vader_lexicon.zip')
@@ -60,12 +69,25 @@ def ensure_vader() -> None:
         nltk.download('vader_lexicon')
 
 
+@lru_cache(maxsize=1)
+def get_vader():
+    """Import NLTK and build the VADER analyzer on first use; None if unavailable.
+
+    Deferred so scripts that never score text don't pay the nltk import cost.
+    """
+    try:
+        from nltk.sentiment import SentimentIntensityAnalyzer
+    except Exception:  # pragma: no cover - optional at runtime
+        return None
+    ensure_vader()
+    return SentimentIntensityAnalyzer()
+
+
 def vader_score(text: str) -> float:
     """Return compound score in [-1, 1] using VADER; fallback to 0 for missing deps."""
-    if nltk is None or SentimentIntensityAnalyzer is None:
+    sia = get_vader()
+    if sia is None:
         return 0.0
-    ensure_vader()
-    sia = SentimentIntensityAnalyzer()
     return float(sia.polarity_scores(text).get("compound", 0.0))
 
 
@@ -91,3 +113,276 @@ def read_jsonl(path: str) -> List[Dict]:
 
 def new_uuid() -> str:
     return str(uuid.uuid4())
+
+
+# -- compact records ----------------------------------------------------------
+#
+# Column-oriented stand-ins for lists of review/profile dicts. Repeated strings
+# (labels, categories, suggestions, skills) become small-int codes, UUIDs are
+# 16 raw bytes, ISO_FMT timestamps are int64 epoch seconds, and review text
+# lives in one UTF-8 buffer. Row key
+# order, unknown keys and rows that don't fit the schema are kept aside, so
+# to_rows() reproduces the JSONL/CSV input exactly.
+
+
+class Interner:
+    """Bidirectional str <-> small int code table."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self.codes: Dict[Any, int] = {}
+        self.values: List[Any] = []
+        for v in values:
+            self.code(v)
+
+    def code(self, value: Any) -> int:
+        c = self.codes.get(value)
+        if c is None:
+            c = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return c
+
+    def value(self, code: int) -> Any:
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def uuid_to_bytes(value: Any) -> Optional[bytes]:
+    """16-byte form of a canonical UUID string, None if it wouldn't round-trip."""
+    if not isinstance(value, str) or len(value) != 36:
+        return None
+    try:
+        u = uuid.UUID(value)
+    except ValueError:
+        return None
+    return u.bytes if str(u) == value else None
+
+
+def _str_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+_INT32_MIN, _INT32_MAX = -(1 << 31), (1 << 31) - 1
+
+
+def _int32_text(value: str) -> bool:
+    """True if value is the canonical decimal text of an int32 (so str(int(v)) == v)."""
+    digits = value[1:] if value.startswith("-") else value
+    if not (digits.isascii() and digits.isdigit()):
+        return False
+    n = int(value)
+    return str(n) == value and _INT32_MIN <= n <= _INT32_MAX
+
+
+def _codes(values: Sequence[int], size: int):
+    """Interned codes as uint16 while the table fits, else uint32."""
+    import numpy as np
+
+    return np.asarray(values, dtype=np.uint16 if size <= 1 << 16 else np.uint32)
+
+
+class _Columns:
+    """Shared bookkeeping: per-row key order, unknown keys, and raw fallback rows."""
+
+    FIELDS: Tuple[str, ...] = ()
+
+    def __init__(self, n: int):
+        import numpy as np
+
+        self.n = n
+        self.schemas = Interner()
+        self.schema = np.zeros(n, dtype=np.uint32)  # narrowed by _finish()
+        self.extras: Dict[int, Dict] = {}
+        self.raw: Dict[int, Dict] = {}
+
+    def _begin_row(self, i: int, row: Dict) -> None:
+        self.schema[i] = self.schemas.code(tuple(row.keys()))
+        extra = {k: v for k, v in row.items() if k not in self.FIELDS}
+        if extra:
+            self.extras[i] = extra
+
+    def _finish(self) -> None:
+        self.schema = _codes(self.schema, len(self.schemas))
+
+    def _assemble(self, i: int, values: Dict) -> Dict:
+        extra = self.extras.get(i, {})
+        return {k: values[k] if k in values else extra[k] for k in self.schemas.value(int(self.schema[i]))}
+
+    def __len__(self) -> int:
+        return self.n
+
+    def to_rows(self) -> List[Dict]:
+        return [self.row(i) for i in range(self.n)]
+
+    def row(self, i: int) -> Dict:  # pragma: no cover - implemented by subclasses
+        raise NotImplementedError
+
+
+def _csr(lists: Sequence[List[int]], dtype):
+    import numpy as np
+
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(x) for x in lists])
+    codes = np.fromiter((c for x in lists for c in x), dtype=dtype, count=int(offsets[-1]))
+    return offsets, codes
+
+
+class ReviewColumns(_Columns):
+    """Compact sentiment_reviews JSONL rows (README_DATA schema)."""
+
+    FIELDS = ("id", "user_id", "text", "score", "label", "categories", "suggestions", "created_at")
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict]) -> "ReviewColumns":
+        import numpy as np
+
+        self = cls(len(rows))
+        self.labels = Interner(("positive", "neutral", "negative"))
+        self.categories = Interner()
+        self.suggestions = Interner()
+        self.ids = np.zeros((self.n, 16), dtype=np.uint8)
+        self.user_ids = np.zeros((self.n, 16), dtype=np.uint8)
+        self.score = np.zeros(self.n, dtype=np.float64)
+        self.label = np.zeros(self.n, dtype=np.uint32)
+        self.created_at = np.zeros(self.n, dtype=np.int64)
+        texts: List[bytes] = []
+        cats: List[List[int]] = []
+        sugs: List[List[int]] = []
+        for i, r in enumerate(rows):
+            rid, uid = uuid_to_bytes(r.get("id")), uuid_to_bytes(r.get("user_id"))
+            created = iso_to_epoch(r.get("created_at"))
+            ok = (
+                rid is not None and uid is not None and isinstance(r.get("text"), str)
+                and type(r.get("score")) is float and isinstance(r.get("label"), str)
+                and _str_list(r.get("categories")) and _str_list(r.get("suggestions"))
+                and created is not None
+            )
+            if not ok:
+                self.raw[i] = r
+                texts.append(b"")
+                cats.append([])
+                sugs.append([])
+                continue
+            self._begin_row(i, r)
+            self.ids[i] = np.frombuffer(rid, dtype=np.uint8)
+            self.user_ids[i] = np.frombuffer(uid, dtype=np.uint8)
+            self.score[i] = r["score"]
+            self.label[i] = self.labels.code(r["label"])
+            self.created_at[i] = created
+            # JSON may carry lone surrogates ("\ud800"); keep them byte-exact.
+            texts.append(r["text"].encode("utf-8", "surrogatepass"))
+            cats.append([self.categories.code(c) for c in r["categories"]])
+            sugs.append([self.suggestions.code(s) for s in r["suggestions"]])
+        self.text_offsets = np.zeros(self.n + 1, dtype=np.int64)
+        self.text_offsets[1:] = np.cumsum([len(t) for t in texts])
+        self.text_buf = b"".join(texts)
+        self.cat_offsets, self.cat_codes = _csr(cats, np.uint32)
+        self.sug_offsets, self.sug_codes = _csr(sugs, np.uint32)
+        self.label = _codes(self.label, len(self.labels))
+        self.cat_codes = _codes(self.cat_codes, len(self.categories))
+        self._finish()
+        return self
+
+    def text(self, i: int) -> str:
+        return self.text_buf[self.text_offsets[i]:self.text_offsets[i + 1]].decode("utf-8", "surrogatepass")
+
+    def row(self, i: int) -> Dict:
+        if i in self.raw:
+            return dict(self.raw[i])
+        cs = self.cat_codes[self.cat_offsets[i]:self.cat_offsets[i + 1]]
+        ss = self.sug_codes[self.sug_offsets[i]:self.sug_offsets[i + 1]]
+        return self._assemble(i, {
+            "id": str(uuid.UUID(bytes=self.ids[i].tobytes())),
+            "user_id": str(uuid.UUID(bytes=self.user_ids[i].tobytes())),
+            "text": self.text(i),
+            "score": float(self.score[i]),
+            "label": self.labels.value(int(self.label[i])),
+            "categories": [self.categories.value(int(c)) for c in cs],
+            "suggestions": [self.suggestions.value(int(s)) for s in ss],
+            "created_at": epoch_to_iso(int(self.created_at[i])),
+        })
+
+    def nbytes(self) -> int:
+        """Approximate payload size of the columns (excluding Python object overhead)."""
+        arrays = (self.ids, self.user_ids, self.score, self.label, self.created_at, self.schema,
+                  self.text_offsets, self.cat_offsets, self.cat_codes, self.sug_offsets, self.sug_codes)
+        return sum(a.nbytes for a in arrays) + len(self.text_buf)
+
+
+class ProfileColumns(_Columns):
+    """Compact freelancer_profiles rows, from CSV (string values) or generator dicts (ints)."""
+
+    INT_FIELDS = (
+        "profile_completeness", "profile_views", "proposal_success_rate", "job_invitations",
+        "hourly_rate", "portfolio_items", "repeat_clients_rate",
+    )
+    FIELDS = ("user_id", "skills", "updated_at") + INT_FIELDS
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict]) -> "ProfileColumns":
+        import numpy as np
+
+        self = cls(len(rows))
+        self.skills = Interner()
+        self.user_ids = np.zeros((self.n, 16), dtype=np.uint8)
+        self.metrics = np.zeros((self.n, len(self.INT_FIELDS)), dtype=np.int32)
+        self.str_numbers = np.zeros(self.n, dtype=bool)  # CSV rows carry numbers as text
+        self.skills_list = np.zeros(self.n, dtype=bool)  # API payloads carry skills as a list
+        self.updated_at = np.zeros(self.n, dtype=np.int64)
+        skill_codes: List[List[int]] = []
+        for i, r in enumerate(rows):
+            uid = uuid_to_bytes(r.get("user_id"))
+            updated = iso_to_epoch(r.get("updated_at"))
+            nums = [r.get(f) for f in self.INT_FIELDS]
+            as_str = all(isinstance(v, str) for v in nums)
+            if as_str:
+                ok = all(_int32_text(v) for v in nums)
+            else:
+                ok = all(type(v) is int and _INT32_MIN <= v <= _INT32_MAX for v in nums)
+            skills = r.get("skills")
+            if isinstance(skills, str):
+                parts = skills.split(";") if skills else []
+                ok = ok and ";".join(parts) == skills and all(parts)
+            else:
+                parts = skills
+                ok = ok and _str_list(skills)
+            if not (ok and uid is not None and updated is not None):
+                self.raw[i] = r
+                skill_codes.append([])
+                continue
+            self._begin_row(i, r)
+            self.user_ids[i] = np.frombuffer(uid, dtype=np.uint8)
+            self.metrics[i] = [int(v) for v in nums]
+            self.str_numbers[i] = as_str
+            self.skills_list[i] = not isinstance(skills, str)
+            self.updated_at[i] = updated
+            skill_codes.append([self.skills.code(s) for s in parts])
+        self.skill_offsets, self.skill_codes = _csr(skill_codes, np.uint32)
+        self._finish()
+        return self
+
+    def skill_ids(self, i: int):
+        """Interned skill codes of row i, without re-splitting strings."""
+        return self.skill_codes[self.skill_offsets[i]:self.skill_offsets[i + 1]]
+
+    def row(self, i: int) -> Dict:
+        if i in self.raw:
+            return dict(self.raw[i])
+        names = [self.skills.value(int(c)) for c in self.skill_ids(i)]
+        conv = str if self.str_numbers[i] else int
+        values = {f: conv(int(v)) for f, v in zip(self.INT_FIELDS, self.metrics[i])}
+        values.update({
+            "user_id": str(uuid.UUID(bytes=self.user_ids[i].tobytes())),
+            "skills": names if self.skills_list[i] else ";".join(names),
+            "updated_at": epoch_to_iso(int(self.updated_at[i])),
+        })
+        return self._assemble(i, values)
+
+    def nbytes(self) -> int:
+        """Approximate payload size of the columns (excluding Python object overhead)."""
+        arrays = (self.user_ids, self.metrics, self.str_numbers, self.skills_list, self.updated_at,
+                  self.schema, self.skill_offsets, self.skill_codes)
+        return sum(a.nbytes for a in arrays)